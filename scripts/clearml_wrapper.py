@@ -9,23 +9,48 @@ Actions:
     create    - Create a new dataset and upload files
     version   - Create a new version of an existing dataset
     download  - Download a dataset to local path
+    download-many - Download several datasets concurrently
     list      - List all datasets
     info      - Get info about a specific dataset
 """
 
 import argparse
+import concurrent.futures as cf
+import functools
+import hashlib
 import json
 import os
+import sqlite3
+import stat
 import sys
+import time
+from contextlib import closing
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 
-# Check if clearml is installed
+# orjson is optional; it only speeds up encoding of the result JSON
 try:
-    from clearml import Dataset, Task
-    CLEARML_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    CLEARML_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+# Persistent metadata cache shared across CLI invocations
+_metadata_cache_path = Path.home() / ".cache" / "clearpipe" / "meta.sqlite"
+_METADATA_CACHE_TTL = 300
+_KEY_SEP = "\x1f"
+
+# Header of the length-prefixed frame carrying the JSON result on stdout
+_JSON_FRAME_HEADER = "CLRMLJSON"
+
+# Number of files listed in create/version/download responses
+_FILES_PREVIEW_LIMIT = 20
+
+
+@functools.cache
+def _web_host() -> str:
+    """ClearML web host used to build dataset URLs; reset by setup_credentials."""
+    return os.environ.get('CLEARML_WEB_HOST', 'https://app.clear.ml')
 
 
 def setup_credentials(api_host: str, web_host: str, files_host: str, 
@@ -39,6 +64,252 @@ def setup_credentials(api_host: str, web_host: str, files_host: str,
     
     # Also set the config to avoid interactive prompts
     os.environ['CLEARML_CONFIG_FILE'] = ''  # Don't read from config file
+    _web_host.cache_clear()
+
+
+def _clearml_not_installed() -> Dict[str, Any]:
+    """Result returned by every action when the ClearML SDK is missing.
+    
+    clearml is imported inside each action rather than at module level so
+    that --help and argument errors don't pay for its import.
+    """
+    return {
+        "success": False,
+        "error": "ClearML SDK not installed. Install with: pip install clearml",
+        "installCommand": "pip install clearml"
+    }
+
+
+def _cache_key(kind: str, *parts: Optional[str]) -> str:
+    """Build a cache key scoped to the ClearML API server and credentials.
+    
+    Every connection shares one cache file, so keys include a digest of the
+    access/secret key pair; another tenant's (or revoked) credentials never
+    hit entries cached for this one.
+    """
+    credentials = hashlib.sha256(
+        f"{os.environ.get('CLEARML_API_ACCESS_KEY', '')}\0{os.environ.get('CLEARML_API_SECRET_KEY', '')}".encode("utf-8")
+    ).hexdigest()
+    return _KEY_SEP.join([os.environ.get('CLEARML_API_HOST', ''), credentials, kind] + [p or "" for p in parts])
+
+
+def _cache_connect() -> sqlite3.Connection:
+    _metadata_cache_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(_metadata_cache_path), timeout=5)
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, json BLOB, ts REAL)")
+    return conn
+
+
+def _cache_get(key: str, ttl: float = _METADATA_CACHE_TTL) -> Optional[Any]:
+    """Return a cached value if present and younger than ttl seconds.
+    
+    The cache is best-effort: any storage error is treated as a miss.
+    """
+    try:
+        with closing(_cache_connect()) as conn:
+            row = conn.execute("SELECT json, ts FROM meta WHERE key = ?", (key,)).fetchone()
+    except (sqlite3.Error, OSError):
+        return None
+    if row is None or time.time() - row[1] > ttl:
+        return None
+    return json.loads(row[0])
+
+
+def _cache_put(key: str, value: Any) -> None:
+    try:
+        with closing(_cache_connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, json, ts) VALUES (?, ?, ?)",
+                (key, json.dumps(value, default=str), time.time())
+            )
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def _cache_invalidate(*prefixes: str) -> None:
+    """Drop every cached entry whose key starts with one of the prefixes."""
+    try:
+        with closing(_cache_connect()) as conn, conn:
+            for prefix in prefixes:
+                conn.execute("DELETE FROM meta WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def _invalidate_dataset_cache(name: str) -> None:
+    """Forget name lookups and listings after a new dataset (version) is created."""
+    _get_dataset.cache_clear()
+    _cache_invalidate(_cache_key("name", name) + _KEY_SEP, _cache_key("list") + _KEY_SEP)
+
+
+@functools.lru_cache(maxsize=128)
+def _get_dataset(
+    dataset_id: Optional[str] = None,
+    dataset_name: Optional[str] = None,
+    dataset_project: Optional[str] = None
+) -> Any:
+    """Dataset.get, memoized for the lifetime of the process."""
+    from clearml import Dataset
+    
+    if dataset_id:
+        return Dataset.get(dataset_id=dataset_id)
+    return Dataset.get(dataset_name=dataset_name, dataset_project=dataset_project)
+
+
+def _cached_get(
+    dataset_id: Optional[str] = None,
+    dataset_name: Optional[str] = None,
+    dataset_project: Optional[str] = None,
+    ttl: float = _METADATA_CACHE_TTL
+) -> Any:
+    """Get a dataset, caching the name/project -> id resolution on disk."""
+    if not dataset_id:
+        key = _cache_key("name", dataset_name, dataset_project)
+        dataset_id = _cache_get(key, ttl)
+        if dataset_id is None:
+            dataset = _get_dataset(dataset_name=dataset_name, dataset_project=dataset_project)
+            if dataset:
+                _cache_put(key, dataset.id)
+            return dataset
+    return _get_dataset(dataset_id=dataset_id)
+
+
+def _walk_files(root: str) -> Iterator[Tuple[str, str, int]]:
+    """Yield (full_path, relative_path, size) for every file under root.
+    
+    Uses os.scandir so file type and size come from the cached DirEntry
+    data instead of a separate stat() per file. Directories that cannot be
+    read are skipped, as rglob does.
+    """
+    # os.scandir joins names onto root as given, so measure the prefix the same way
+    prefix_len = len(os.path.join(root, ""))
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path, entry.path[prefix_len:], entry.stat().st_size
+
+
+def _stat_input_paths(
+    input_paths: Optional[List[str]]
+) -> Tuple[List[Tuple[Path, os.stat_result]], Optional[str]]:
+    """Stat each input path once, keeping regular files and directories.
+    
+    Returns the kept (path, stat) pairs and the first path that could not
+    be stat'ed (missing, a dangling link, a file used as a directory...),
+    or None when all of them could.
+    """
+    paths = []
+    for input_path in input_paths or []:
+        try:
+            st = os.stat(input_path)
+        except OSError:
+            return paths, input_path
+        if stat.S_ISREG(st.st_mode) or stat.S_ISDIR(st.st_mode):
+            paths.append((Path(input_path), st))
+    return paths, None
+
+
+def _collect_sizes(path: Path, st: os.stat_result) -> Tuple[List[Dict[str, Any]], int, int]:
+    """Describe the file(s) under a path for the response JSON.
+    
+    Returns a preview of the first _FILES_PREVIEW_LIMIT files, the file
+    count and the total size from a single traversal.
+    """
+    if not stat.S_ISDIR(st.st_mode):
+        return [{"path": str(path), "name": path.name, "size": st.st_size}], 1, st.st_size
+    files = []
+    file_count = 0
+    total_size = 0
+    for full, rel, size in _walk_files(str(path)):
+        if file_count < _FILES_PREVIEW_LIMIT:
+            files.append({"path": full, "name": rel, "size": size})
+        file_count += 1
+        total_size += size
+    return files, file_count, total_size
+
+
+def _pending_upload_size(dataset: Any) -> int:
+    """Bytes of file entries added but not yet uploaded."""
+    entries = getattr(dataset, '_dataset_file_entries', None) or {}
+    return sum(entry.size or 0 for entry in entries.values() if entry.local_path)
+
+
+def _add_and_upload(
+    dataset: Any,
+    paths: List[Tuple[Path, os.stat_result]],
+    chunk_size_mb: Optional[int] = None,
+    upload_workers: Optional[int] = None,
+    hash_workers: Optional[int] = None
+) -> Tuple[List[Dict[str, Any]], int, int]:
+    """Add input paths to a dataset and upload them, overlapping local work.
+    
+    The size walks for the response run on a thread pool while this thread
+    adds each path. add_files and upload both mutate the dataset's file
+    manifest, so they run one after another; the walks only read the local
+    tree and overlap with add_files. They are collected before the upload
+    starts so a walk error fails the request before anything is sent.
+    Upload chunking is sized from the bytes actually pending, so unchanged
+    files of a new version don't count.
+    
+    add_files hashes the files of each path on its own thread pool of
+    hash_workers threads (ClearML defaults to the logical core count).
+    The digest must stay SHA-256 so files dedup against parent versions;
+    hashlib's OpenSSL backend already uses SHA-NI where the CPU has it.
+    Returns the file preview, the file count and the total size, merged in
+    input order so the response is deterministic.
+    """
+    with cf.ThreadPoolExecutor(max_workers=max(1, min(32, len(paths)))) as ex:
+        walks = [ex.submit(_collect_sizes, path, st) for path, st in paths]
+        for path, _ in paths:
+            dataset.add_files(path=str(path), max_workers=hash_workers)
+        results = [walk.result() for walk in walks]
+    dataset.upload(**_upload_options(_pending_upload_size(dataset), chunk_size_mb, upload_workers))
+    
+    files_added = []
+    file_count = 0
+    total_size = 0
+    for files, count, size in results:
+        files_added.extend(files[:_FILES_PREVIEW_LIMIT - len(files_added)])
+        file_count += count
+        total_size += size
+    return files_added, file_count, total_size
+
+
+def _upload_options(
+    total_size: int,
+    chunk_size_mb: Optional[int] = None,
+    upload_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """Pick upload chunk size and parallelism from the total payload size.
+    
+    Connection reuse is left to ClearML: its API and file-server clients
+    already share pooled, retrying requests sessions (api.http.pool_maxsize,
+    default 512), which comfortably covers max_workers.
+    """
+    if chunk_size_mb is None:
+        if total_size > 5 * 2**30:
+            chunk_size_mb = 512
+        elif total_size > 256 * 2**20:
+            chunk_size_mb = 128
+        else:
+            chunk_size_mb = 32
+    if upload_workers is None:
+        upload_workers = min(16, max(4, (os.cpu_count() or 1) * 2))
+    return {
+        "chunk_size": chunk_size_mb,
+        "max_workers": upload_workers,
+        "show_progress": False,
+        "retries": 3
+    }
 
 
 def create_dataset(
@@ -47,10 +318,26 @@ def create_dataset(
     input_paths: Optional[List[str]] = None,
     tags: Optional[List[str]] = None,
     description: Optional[str] = None,
-    output_uri: Optional[str] = None
+    output_uri: Optional[str] = None,
+    chunk_size_mb: Optional[int] = None,
+    upload_workers: Optional[int] = None,
+    hash_workers: Optional[int] = None
 ) -> Dict[str, Any]:
     """Create a new ClearML dataset and upload files."""
     try:
+        from clearml import Dataset
+    except ImportError:
+        return _clearml_not_installed()
+    
+    try:
+        # Validate input paths before anything is created on the server
+        paths, missing = _stat_input_paths(input_paths)
+        if missing is not None:
+            return {
+                "success": False,
+                "error": f"Path does not exist: {missing}"
+            }
+        
         # Create the dataset
         dataset = Dataset.create(
             dataset_name=name,
@@ -60,55 +347,22 @@ def create_dataset(
             output_uri=output_uri  # None uses default ClearML file server
         )
         
-        files_added = []
-        total_size = 0
-        
-        # Add files from input paths
-        if input_paths:
-            for input_path in input_paths:
-                path = Path(input_path)
-                if not path.exists():
-                    return {
-                        "success": False,
-                        "error": f"Path does not exist: {input_path}"
-                    }
-                
-                if path.is_file():
-                    # Add single file
-                    dataset.add_files(path=str(path))
-                    size = path.stat().st_size
-                    files_added.append({
-                        "path": str(path),
-                        "name": path.name,
-                        "size": size
-                    })
-                    total_size += size
-                elif path.is_dir():
-                    # Add directory recursively
-                    dataset.add_files(path=str(path))
-                    for file_path in path.rglob("*"):
-                        if file_path.is_file():
-                            size = file_path.stat().st_size
-                            files_added.append({
-                                "path": str(file_path),
-                                "name": str(file_path.relative_to(path)),
-                                "size": size
-                            })
-                            total_size += size
-        
-        # Upload and finalize the dataset
-        dataset.upload()
+        # Add files, upload and finalize
+        files_added, file_count, total_size = _add_and_upload(
+            dataset, paths, chunk_size_mb, upload_workers, hash_workers
+        )
         dataset.finalize()
+        _invalidate_dataset_cache(name)
         
         return {
             "success": True,
             "datasetId": dataset.id,
             "datasetName": name,
             "datasetProject": project or "datasets",
-            "filesAdded": len(files_added),
+            "filesAdded": file_count,
             "totalSize": total_size,
-            "files": files_added[:20],  # Limit to first 20 for response size
-            "webUrl": f"{os.environ.get('CLEARML_WEB_HOST', 'https://app.clear.ml')}/datasets/{dataset.id}"
+            "files": files_added,  # Limited to the first _FILES_PREVIEW_LIMIT files
+            "webUrl": f"{_web_host()}/datasets/{dataset.id}"
         }
         
     except Exception as e:
@@ -124,18 +378,34 @@ def create_version(
     parent_project: Optional[str] = None,
     input_paths: Optional[List[str]] = None,
     tags: Optional[List[str]] = None,
-    description: Optional[str] = None
+    description: Optional[str] = None,
+    chunk_size_mb: Optional[int] = None,
+    upload_workers: Optional[int] = None,
+    hash_workers: Optional[int] = None
 ) -> Dict[str, Any]:
     """Create a new version of an existing dataset."""
     try:
-        # Get parent dataset
+        from clearml import Dataset
+    except ImportError:
+        return _clearml_not_installed()
+    
+    try:
+        # Validate input paths before anything is created on the server
+        paths, missing = _stat_input_paths(input_paths)
+        if missing is not None:
+            return {
+                "success": False,
+                "error": f"Path does not exist: {missing}"
+            }
+        
+        # Get parent dataset. A name is resolved against the server rather than
+        # the on-disk cache, which may still point at an older latest version.
         if parent_id:
-            parent_dataset = Dataset.get(dataset_id=parent_id)
+            parent_dataset = _get_dataset(dataset_id=parent_id)
         elif parent_name:
-            parent_dataset = Dataset.get(
-                dataset_name=parent_name,
-                dataset_project=parent_project
-            )
+            parent_dataset = _get_dataset(dataset_name=parent_name, dataset_project=parent_project)
+            if parent_dataset:
+                _cache_put(_cache_key("name", parent_name, parent_project), parent_dataset.id)
         else:
             return {
                 "success": False,
@@ -157,43 +427,12 @@ def create_version(
             description=description or f"New version created by ClearPipe"
         )
         
-        files_added = []
-        total_size = 0
-        
-        # Add files from input paths
-        if input_paths:
-            for input_path in input_paths:
-                path = Path(input_path)
-                if not path.exists():
-                    return {
-                        "success": False,
-                        "error": f"Path does not exist: {input_path}"
-                    }
-                
-                if path.is_file():
-                    new_dataset.add_files(path=str(path))
-                    size = path.stat().st_size
-                    files_added.append({
-                        "path": str(path),
-                        "name": path.name,
-                        "size": size
-                    })
-                    total_size += size
-                elif path.is_dir():
-                    new_dataset.add_files(path=str(path))
-                    for file_path in path.rglob("*"):
-                        if file_path.is_file():
-                            size = file_path.stat().st_size
-                            files_added.append({
-                                "path": str(file_path),
-                                "name": str(file_path.relative_to(path)),
-                                "size": size
-                            })
-                            total_size += size
-        
-        # Upload and finalize
-        new_dataset.upload()
+        # Add files, upload and finalize
+        files_added, file_count, total_size = _add_and_upload(
+            new_dataset, paths, chunk_size_mb, upload_workers, hash_workers
+        )
         new_dataset.finalize()
+        _invalidate_dataset_cache(new_dataset.name)
         
         return {
             "success": True,
@@ -201,10 +440,10 @@ def create_version(
             "parentId": parent_dataset.id,
             "datasetName": new_dataset.name,
             "datasetProject": new_dataset.project,
-            "filesAdded": len(files_added),
+            "filesAdded": file_count,
             "totalSize": total_size,
-            "files": files_added[:20],
-            "webUrl": f"{os.environ.get('CLEARML_WEB_HOST', 'https://app.clear.ml')}/datasets/{new_dataset.id}"
+            "files": files_added,
+            "webUrl": f"{_web_host()}/datasets/{new_dataset.id}"
         }
         
     except Exception as e:
@@ -218,18 +457,19 @@ def download_dataset(
     dataset_id: Optional[str] = None,
     dataset_name: Optional[str] = None,
     dataset_project: Optional[str] = None,
-    output_path: Optional[str] = None
+    output_path: Optional[str] = None,
+    overwrite: bool = False
 ) -> Dict[str, Any]:
     """Download a dataset to local path."""
+    try:
+        from clearml import Dataset
+    except ImportError:
+        return _clearml_not_installed()
+    
     try:
         # Get the dataset
-        if dataset_id:
-            dataset = Dataset.get(dataset_id=dataset_id)
-        elif dataset_name:
-            dataset = Dataset.get(
-                dataset_name=dataset_name,
-                dataset_project=dataset_project
-            )
+        if dataset_id or dataset_name:
+            dataset = _cached_get(dataset_id, dataset_name, dataset_project)
         else:
             return {
                 "success": False,
@@ -244,27 +484,29 @@ def download_dataset(
         
         # Download to specified path or default
         target_path = output_path or str(Path.cwd() / "data" / "downloaded" / dataset.name)
-        local_path = dataset.get_local_copy(target_folder=target_path)
+        # ClearML raises a bare ValueError for a non-empty target; check first to give a hint
+        target = Path(target_path)
+        if not overwrite and target.is_dir() and any(target.iterdir()):
+            return {
+                "success": False,
+                "error": f"Target folder is not empty: {target_path} (pass --overwrite to replace it)"
+            }
+        local_path = dataset.get_mutable_local_copy(target_folder=target_path, overwrite=overwrite)
         
-        # Count downloaded files
+        # Count downloaded files, keeping details only for the first few
         files_downloaded = []
+        file_count = 0
         path = Path(local_path)
-        if path.exists():
-            for file_path in path.rglob("*"):
-                if file_path.is_file():
-                    files_downloaded.append({
-                        "path": str(file_path),
-                        "name": str(file_path.relative_to(path)),
-                        "size": file_path.stat().st_size
-                    })
+        if path.is_dir():
+            files_downloaded, file_count, _ = _collect_sizes(path, path.stat())
         
         return {
             "success": True,
             "datasetId": dataset.id,
             "datasetName": dataset.name,
             "localPath": local_path,
-            "filesDownloaded": len(files_downloaded),
-            "files": files_downloaded[:20]
+            "filesDownloaded": file_count,
+            "files": files_downloaded
         }
         
     except Exception as e:
@@ -274,6 +516,37 @@ def download_dataset(
         }
 
 
+def download_many(
+    ids: List[str],
+    output_root: Optional[str] = None,
+    workers: int = 8,
+    overwrite: bool = False
+) -> Dict[str, Any]:
+    """Download several datasets concurrently, each into <output_root>/<dataset_id>."""
+    root = Path(output_root) if output_root else Path.cwd() / "data" / "downloaded"
+    # A repeated id would start two copies into the same folder
+    ids = list(dict.fromkeys(ids))
+    results: Dict[str, Dict[str, Any]] = {}
+    with cf.ThreadPoolExecutor(max_workers=max(1, min(workers, len(ids)))) as ex:
+        futures = {
+            ex.submit(download_dataset, dataset_id=i, output_path=str(root / i), overwrite=overwrite): i
+            for i in ids
+        }
+        for future in cf.as_completed(futures):
+            results[futures[future]] = future.result()
+    
+    downloads = [results[i] for i in ids]
+    failed = [r for r in downloads if not r.get("success")]
+    result = {
+        "success": not failed,
+        "count": len(downloads),
+        "datasets": downloads
+    }
+    if failed:
+        result["error"] = f"{len(failed)} of {len(downloads)} downloads failed"
+    return result
+
+
 def list_datasets(
     project: Optional[str] = None,
     tags: Optional[List[str]] = None,
@@ -281,6 +554,16 @@ def list_datasets(
 ) -> Dict[str, Any]:
     """List all datasets."""
     try:
+        cache_key = _cache_key("list", project, str(only_completed), *sorted(tags or []))
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            from clearml import Dataset
+        except ImportError:
+            return _clearml_not_installed()
+        
         datasets = Dataset.list_datasets(
             dataset_project=project,
             tags=tags,
@@ -298,11 +581,13 @@ def list_datasets(
                 "version": ds_info.get("version"),
             })
         
-        return {
+        result = {
             "success": True,
             "count": len(dataset_list),
             "datasets": dataset_list
         }
+        _cache_put(cache_key, result)
+        return result
         
     except Exception as e:
         return {
@@ -318,13 +603,19 @@ def get_dataset_info(
 ) -> Dict[str, Any]:
     """Get detailed info about a dataset."""
     try:
+        # Finalized datasets are immutable, so their info can be served from cache
         if dataset_id:
-            dataset = Dataset.get(dataset_id=dataset_id)
-        elif dataset_name:
-            dataset = Dataset.get(
-                dataset_name=dataset_name,
-                dataset_project=dataset_project
-            )
+            cached = _cache_get(_cache_key("info", dataset_id))
+            if cached is not None:
+                return cached
+        
+        try:
+            from clearml import Dataset
+        except ImportError:
+            return _clearml_not_installed()
+        
+        if dataset_id or dataset_name:
+            dataset = _cached_get(dataset_id, dataset_name, dataset_project)
         else:
             return {
                 "success": False,
@@ -339,14 +630,17 @@ def get_dataset_info(
         
         # Get file list
         file_entries = dataset.list_files()
+        # Sizes come from the dataset's in-memory manifests, no per-file lookups
+        entries_dict = dict(getattr(dataset, '_dataset_link_entries', None) or {})
+        entries_dict.update(getattr(dataset, '_dataset_file_entries', None) or {})
         files = []
         for entry in file_entries[:50]:  # Limit to 50 files
             files.append({
                 "path": entry,
-                "size": dataset.get_file_size(entry) if hasattr(dataset, 'get_file_size') else None
+                "size": getattr(entries_dict.get(entry), 'size', None)
             })
         
-        return {
+        result = {
             "success": True,
             "datasetId": dataset.id,
             "datasetName": dataset.name,
@@ -355,8 +649,11 @@ def get_dataset_info(
             "fileCount": len(file_entries),
             "files": files,
             "isFinalized": dataset.is_final(),
-            "webUrl": f"{os.environ.get('CLEARML_WEB_HOST', 'https://app.clear.ml')}/datasets/{dataset.id}"
+            "webUrl": f"{_web_host()}/datasets/{dataset.id}"
         }
+        if result["isFinalized"]:
+            _cache_put(_cache_key("info", dataset.id), result)
+        return result
         
     except Exception as e:
         return {
@@ -365,18 +662,44 @@ def get_dataset_info(
         }
 
 
-def main():
-    if not CLEARML_AVAILABLE:
-        result = {
-            "success": False,
-            "error": "ClearML SDK not installed. Install with: pip install clearml",
-            "installCommand": "pip install clearml"
-        }
-        print(json.dumps(result))
-        sys.exit(1)
+def _write_json(result: Dict[str, Any]) -> None:
+    """Write the result to stdout as a length-prefixed frame.
     
+    The frame is a "CLRMLJSON <n>" header line followed by exactly n bytes
+    of compact JSON, so callers can skip any ClearML output before the
+    header and read the payload without scanning for an end marker.
+    """
+    if ORJSON_AVAILABLE:
+        # Datetimes go through default=str, matching the stdlib encoder and the cache
+        payload = orjson.dumps(
+            result,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            default=str
+        )
+    else:
+        payload = json.dumps(result, default=str).encode("utf-8")
+    sys.stdout.flush()
+    sys.stdout.buffer.write(f"{_JSON_FRAME_HEADER} {len(payload)}\n".encode("ascii"))
+    sys.stdout.buffer.write(payload)
+    sys.stdout.buffer.flush()
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for sizes and worker counts, rejected before any dataset is created."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value!r}")
+    return number
+
+
+@functools.cache
+def _parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once; repeated in-process main() calls reuse it."""
     parser = argparse.ArgumentParser(description="ClearML Dataset Wrapper for ClearPipe")
-    parser.add_argument("action", choices=["create", "version", "download", "list", "info"],
+    parser.add_argument("action", choices=["create", "version", "download", "download-many", "list", "info"],
                         help="Action to perform")
     
     # Credentials (required for all actions)
@@ -392,7 +715,8 @@ def main():
                         help="ClearML secret key")
     
     # Dataset identification
-    parser.add_argument("--dataset-id", help="Dataset ID")
+    parser.add_argument("--dataset-id", action="append", dest="dataset_ids",
+                        help="Dataset ID (can be specified multiple times for download-many)")
     parser.add_argument("--dataset-name", help="Dataset name")
     parser.add_argument("--dataset-project", help="Dataset project")
     
@@ -403,15 +727,31 @@ def main():
                         help="Tags to apply (can be specified multiple times)")
     parser.add_argument("--description", help="Dataset description")
     parser.add_argument("--output-uri", help="Output URI for upload")
+    parser.add_argument("--chunk-size-mb", type=_positive_int,
+                        help="Upload chunk size in MB (default: based on total size)")
+    parser.add_argument("--upload-workers", type=_positive_int,
+                        help="Number of parallel upload workers (default: based on CPU count)")
+    parser.add_argument("--hash-workers", type=_positive_int,
+                        help="Threads used to hash files while adding them (default: logical core count)")
     
     # Download options
     parser.add_argument("--output-path", help="Output path for download")
+    parser.add_argument("--download-workers", type=_positive_int, default=8,
+                        help="Number of datasets to download in parallel (download-many)")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Replace the contents of a non-empty download folder")
     
     # List options
     parser.add_argument("--only-completed", action="store_true", default=True,
                         help="Only list completed datasets")
     
-    args = parser.parse_args()
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    args = _parser().parse_args(argv)
+    # Single-dataset actions use the last --dataset-id given
+    args.dataset_id = args.dataset_ids[-1] if args.dataset_ids else None
     
     # Setup credentials
     setup_credentials(
@@ -435,7 +775,10 @@ def main():
                 input_paths=args.input_paths,
                 tags=args.tags,
                 description=args.description,
-                output_uri=args.output_uri
+                output_uri=args.output_uri,
+                chunk_size_mb=args.chunk_size_mb,
+                upload_workers=args.upload_workers,
+                hash_workers=args.hash_workers
             )
     
     elif args.action == "version":
@@ -450,7 +793,10 @@ def main():
                 parent_project=args.dataset_project,
                 input_paths=args.input_paths,
                 tags=args.tags,
-                description=args.description
+                description=args.description,
+                chunk_size_mb=args.chunk_size_mb,
+                upload_workers=args.upload_workers,
+                hash_workers=args.hash_workers
             )
     
     elif args.action == "download":
@@ -458,9 +804,21 @@ def main():
             dataset_id=args.dataset_id,
             dataset_name=args.dataset_name,
             dataset_project=args.dataset_project,
-            output_path=args.output_path
+            output_path=args.output_path,
+            overwrite=args.overwrite
         )
     
+    elif args.action == "download-many":
+        if not args.dataset_ids:
+            result = {"success": False, "error": "At least one dataset ID is required for download-many action"}
+        else:
+            result = download_many(
+                ids=args.dataset_ids,
+                output_root=args.output_path,
+                workers=args.download_workers,
+                overwrite=args.overwrite
+            )
+    
     elif args.action == "list":
         result = list_datasets(
             project=args.dataset_project,
@@ -478,11 +836,7 @@ def main():
     else:
         result = {"success": False, "error": f"Unknown action: {args.action}"}
     
-    # Output JSON result with a clear separator to help parsing
-    # Use a marker that won't appear in ClearML output
-    print("---CLEARML_JSON_START---", flush=True)
-    print(json.dumps(result, indent=2, default=str), flush=True)
-    print("---CLEARML_JSON_END---", flush=True)
+    _write_json(result)
     sys.exit(0 if result.get("success") else 1)
 
 
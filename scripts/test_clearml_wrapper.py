@@ -6,7 +6,14 @@ Usage: uv run python scripts/test_clearml_wrapper.py
 
 import sys
 import json
-import subprocess
+import io
+import contextlib
+import importlib.util
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
 
 def test_clearml_import():
     """Test if ClearML can be imported."""
@@ -35,24 +42,191 @@ def test_wrapper_syntax():
         print("❌ clearml_wrapper.py not found")
         return False
 
+def load_wrapper():
+    """Import clearml_wrapper.py in-process (it imports clearml lazily)."""
+    spec = importlib.util.spec_from_file_location("clearml_wrapper", "scripts/clearml_wrapper.py")
+    wrapper = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(wrapper)
+    return wrapper
+
 def test_wrapper_help():
     """Test if the wrapper can show help."""
     try:
-        result = subprocess.run(
-            [sys.executable, "scripts/clearml_wrapper.py", "--help"],
-            capture_output=True,
-            text=True
-        )
-        if "ClearML Dataset Wrapper" in result.stdout:
+        # Run the parser in-process rather than spawning a new interpreter
+        wrapper = load_wrapper()
+        
+        buf = io.StringIO()
+        with contextlib.redirect_stdout(buf), contextlib.suppress(SystemExit):
+            wrapper.main(["--help"])
+        output = buf.getvalue()
+        if "ClearML Dataset Wrapper" in output:
             print("✅ clearml_wrapper.py --help works correctly")
             return True
         else:
-            print(f"⚠️ Unexpected help output: {result.stdout[:200]}")
+            print(f"⚠️ Unexpected help output: {output[:200]}")
             return False
     except Exception as e:
         print(f"❌ Failed to run wrapper: {e}")
         return False
 
+def test_add_files_serial():
+    """Test that add_files calls on one dataset never overlap (ClearML isn't thread-safe there)."""
+    class FakeDataset:
+        _dataset_file_entries = {}
+        
+        def __init__(self):
+            self.active = 0
+            self.overlapped = False
+            self.lock = threading.Lock()
+        
+        def add_files(self, path, max_workers=None):
+            with self.lock:
+                self.active += 1
+                self.overlapped |= self.active > 1
+            time.sleep(0.01)
+            with self.lock:
+                self.active -= 1
+        
+        def upload(self, **kwargs):
+            pass
+    
+    try:
+        wrapper = load_wrapper()
+        dataset = FakeDataset()
+        paths = [(wrapper.Path(p), wrapper.os.stat(p)) for p in ["scripts"] * 4]
+        wrapper._add_and_upload(dataset, paths)
+        # No valid inputs must not produce a zero-sized thread pool
+        wrapper._add_and_upload(dataset, [])
+        if dataset.overlapped:
+            print("❌ add_files calls ran concurrently on the same dataset")
+            return False
+        print("✅ add_files calls run serially")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to add files: {e}")
+        return False
+
+def test_json_frame():
+    """Test the length-prefixed JSON frame the Node routes parse."""
+    payload = {"success": True, "datasetName": "données ✓ 数据", "files": [{"size": 3}]}
+    try:
+        wrapper = load_wrapper()
+        for use_orjson in sorted({False, wrapper.ORJSON_AVAILABLE}):
+            wrapper.ORJSON_AVAILABLE = use_orjson
+            raw = io.BytesIO()
+            stdout = sys.stdout
+            sys.stdout = io.TextIOWrapper(raw, encoding="utf-8")
+            try:
+                print("2025-01-01 ClearML Task: some log line")
+                wrapper._write_json(payload)
+            finally:
+                sys.stdout.detach()  # keep raw open once the wrapper is dropped
+                sys.stdout = stdout
+            
+            # Same steps as the routes: find the header line, then slice <n> bytes after it
+            output = raw.getvalue().decode("utf-8")
+            header_idx = output.index("CLRMLJSON ")
+            newline_idx = output.index("\n", header_idx)
+            length = int(output[header_idx + len("CLRMLJSON "):newline_idx])
+            body = output[newline_idx + 1:].encode("utf-8")
+            if len(body) != length or json.loads(body[:length].decode("utf-8")) != payload:
+                print(f"❌ JSON frame mismatch (orjson={use_orjson}): {output[:200]}")
+                return False
+        print("✅ JSON output frame parses correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to write JSON frame: {e}")
+        return False
+
+def test_walk_files():
+    """Test directory walking and the bounded file preview."""
+    try:
+        wrapper = load_wrapper()
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "a", "b"))
+            expected = {}
+            for i, rel in enumerate(["x.txt", os.path.join("a", "y.txt"), os.path.join("a", "b", "z.txt")]):
+                with open(os.path.join(root, rel), "wb") as f:
+                    f.write(b"0" * (i + 1))
+                expected[rel] = i + 1
+            
+            for given in (root, os.path.join(root, "")):
+                found = {rel: size for _, rel, size in wrapper._walk_files(given)}
+                if found != expected:
+                    print(f"❌ _walk_files({given!r}) returned {found}")
+                    return False
+            
+            # Unreadable directories are skipped rather than aborting the walk.
+            # chmod 000 has no effect as root, so simulate the permission error.
+            unreadable = os.path.join(root, "a", "b")
+            scandir = os.scandir
+            def guarded_scandir(path):
+                if path == unreadable:
+                    raise PermissionError(13, "Permission denied", path)
+                return scandir(path)
+            with mock.patch.object(wrapper.os, "scandir", guarded_scandir):
+                found = {rel: size for _, rel, size in wrapper._walk_files(root)}
+            del expected[os.path.join("a", "b", "z.txt")]
+            if found != expected:
+                print(f"❌ _walk_files with an unreadable directory returned {found}")
+                return False
+            
+            wrapper._FILES_PREVIEW_LIMIT = 2
+            files, count, total = wrapper._collect_sizes(wrapper.Path(root), os.stat(root))
+            if len(files) != 2 or count != 3 or total != 6:
+                print(f"❌ _collect_sizes returned {len(files)} files, count={count}, total={total}")
+                return False
+        print("✅ Directory walk and file preview work correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to walk files: {e}")
+        return False
+
+def test_metadata_cache():
+    """Test the on-disk metadata cache: TTL, invalidation and credential scoping."""
+    try:
+        wrapper = load_wrapper()
+        credentials = {
+            "CLEARML_API_HOST": "http://api.example",
+            "CLEARML_API_ACCESS_KEY": "access",
+            "CLEARML_API_SECRET_KEY": "secret",
+        }
+        with tempfile.TemporaryDirectory() as root, mock.patch.dict(os.environ, credentials):
+            wrapper._metadata_cache_path = wrapper.Path(root) / "meta.sqlite"
+            
+            name_key = wrapper._cache_key("name", "ds", "proj")
+            list_key = wrapper._cache_key("list", "proj", "True")
+            info_key = wrapper._cache_key("info", "abc123")
+            for key, value in ((name_key, "abc123"), (list_key, [{"id": "abc123"}]), (info_key, {"id": "abc123"})):
+                wrapper._cache_put(key, value)
+            if wrapper._cache_get(name_key) != "abc123" or wrapper._cache_get(list_key) != [{"id": "abc123"}]:
+                print("❌ Cached values did not round-trip")
+                return False
+            if wrapper._cache_get(name_key, ttl=-1) is not None:
+                print("❌ Expired cache entry was returned")
+                return False
+            
+            with mock.patch.dict(os.environ, {"CLEARML_API_ACCESS_KEY": "other"}):
+                other_access = wrapper._cache_key("name", "ds", "proj")
+            with mock.patch.dict(os.environ, {"CLEARML_API_SECRET_KEY": "other"}):
+                other_secret = wrapper._cache_key("name", "ds", "proj")
+            if name_key in (other_access, other_secret):
+                print("❌ Cache keys don't depend on the credentials")
+                return False
+            
+            wrapper._invalidate_dataset_cache("ds")
+            if wrapper._cache_get(name_key) is not None or wrapper._cache_get(list_key) is not None:
+                print("❌ Name and list entries survived invalidation")
+                return False
+            if wrapper._cache_get(info_key) != {"id": "abc123"}:
+                print("❌ Info entry was dropped by invalidation")
+                return False
+        print("✅ Metadata cache expires, invalidates and scopes keys correctly")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to use the metadata cache: {e}")
+        return False
+
 def main():
     print("=" * 60)
     print("ClearML Wrapper Test Suite")
@@ -69,10 +243,25 @@ def main():
     results.append(("Wrapper Syntax", test_wrapper_syntax()))
     print()
     
-    # Test 3: Wrapper help (only if ClearML is available)
-    if results[0][1]:  # ClearML was imported successfully
-        results.append(("Wrapper Help", test_wrapper_help()))
-        print()
+    # Test 3: Wrapper help (clearml is imported lazily, so this works without it)
+    results.append(("Wrapper Help", test_wrapper_help()))
+    print()
+    
+    # Test 4: add_files serialization
+    results.append(("Serial add_files", test_add_files_serial()))
+    print()
+    
+    # Test 5: JSON output framing
+    results.append(("JSON Frame", test_json_frame()))
+    print()
+    
+    # Test 6: Directory walk helpers
+    results.append(("Walk Files", test_walk_files()))
+    print()
+    
+    # Test 7: Metadata cache
+    results.append(("Metadata cache", test_metadata_cache()))
+    print()
     
     # Summary
     print("=" * 60)
@@ -322,24 +322,15 @@ function executePythonWrapper(
       }
       
       try {
-        // Extract JSON between markers if present
+        // Extract the JSON frame: a "CLRMLJSON <bytes>" header line followed by the payload
         let jsonStr = stdout;
-        const startMarker = '---CLEARML_JSON_START---';
-        const endMarker = '---CLEARML_JSON_END---';
+        const frameHeader = 'CLRMLJSON ';
+        const headerIdx = stdout.indexOf(frameHeader);
+        const newlineIdx = headerIdx !== -1 ? stdout.indexOf('\n', headerIdx) : -1;
         
-        const startIdx = stdout.indexOf(startMarker);
-        const endIdx = stdout.indexOf(endMarker);
-        
-        if (startIdx !== -1 && endIdx !== -1) {
-          jsonStr = stdout.substring(startIdx + startMarker.length, endIdx).trim();
-        } else if (startIdx !== -1) {
-          // End marker might be truncated, extract from start marker to end
-          jsonStr = stdout.substring(startIdx + startMarker.length).trim();
-          // Try to find the end of the JSON object
-          const lastBrace = jsonStr.lastIndexOf('}');
-          if (lastBrace !== -1) {
-            jsonStr = jsonStr.substring(0, lastBrace + 1);
-          }
+        if (newlineIdx !== -1) {
+          const length = parseInt(stdout.substring(headerIdx + frameHeader.length, newlineIdx), 10);
+          jsonStr = Buffer.from(stdout.substring(newlineIdx + 1), 'utf8').subarray(0, length).toString('utf8');
         }
         
         const result = JSON.parse(jsonStr);
@@ -336,18 +336,18 @@ async function executeClearMLPython(
     result = await executeCommand(pythonCheck.python!, args, {});
   }
   
-  // Extract JSON from stdout using markers
+  // Extract JSON from stdout using the length-prefixed frame
   const fullOutput = result.stdout;
   let jsonOutput = '';
   
-  // Look for our JSON markers
-  const startMarker = '---CLEARML_JSON_START---';
-  const endMarker = '---CLEARML_JSON_END---';
-  const startIdx = fullOutput.indexOf(startMarker);
-  const endIdx = fullOutput.indexOf(endMarker);
+  // Look for our "CLRMLJSON <bytes>" header line; the payload follows it
+  const frameHeader = 'CLRMLJSON ';
+  const headerIdx = fullOutput.indexOf(frameHeader);
+  const newlineIdx = headerIdx !== -1 ? fullOutput.indexOf('\n', headerIdx) : -1;
   
-  if (startIdx !== -1 && endIdx !== -1) {
-    jsonOutput = fullOutput.substring(startIdx + startMarker.length, endIdx).trim();
+  if (newlineIdx !== -1) {
+    const length = parseInt(fullOutput.substring(headerIdx + frameHeader.length, newlineIdx), 10);
+    jsonOutput = Buffer.from(fullOutput.substring(newlineIdx + 1), 'utf8').subarray(0, length).toString('utf8');
   } else {
     // Fallback: try to find JSON by matching braces
     const jsonMatch = fullOutput.match(/\{[\s\S]*"success"[\s\S]*\}/);
@@ -369,7 +369,7 @@ async function executeClearMLPython(
     
     // Check if it's a JSON error response
     try {
-      const jsonResult = JSON.parse(result.stdout);
+      const jsonResult = JSON.parse(jsonOutput);
       if (jsonResult.error) {
         errorMessage = jsonResult.error;
       }